@@ -4,12 +4,18 @@ PTY wrapper that auto-accepts prompts and re-prompts Claude Code.
 
 Used by the "yolo" modifier to auto-accept plan approval and permission prompts.
 Used by the "loop" modifier to periodically re-prompt Claude when idle.
+Used by the "queue" modifier to inject prompts dropped into a spool directory.
+Loop and queue prompts are paced against the shared Claude usage window.
 
 All I/O passes through transparently. The user can still type normally.
 During the accept delay, keystrokes cancel auto-accept and forward to the child.
 """
 
+import collections
+import ctypes
+import ctypes.util
 import glob
+import json
 import os
 import sys
 import pty
@@ -18,6 +24,8 @@ import fcntl
 import logging
 import select
 import signal
+import socket
+import subprocess
 import termios
 import time
 import tty
@@ -60,6 +68,7 @@ YOLO_TRIGGERS = [
 
 YOLO_MODE = os.environ.get("CLAUDIUS_YOLO", "0") == "1"
 LOOP_MODE = os.environ.get("CLAUDIUS_LOOP", "0") == "1"
+QUEUE_MODE = os.environ.get("CLAUDIUS_QUEUE", "0") == "1"
 
 # Triggers only fire in yolo mode. Loop-only mode does no auto-accepting.
 ALL_TRIGGERS = (PLAN_TRIGGERS + YOLO_TRIGGERS) if YOLO_MODE else []
@@ -121,6 +130,230 @@ LOOP_FILE = "/workspace/LOOP.md"
 LOOP_IDLE_THRESHOLD = 120    # seconds of output silence → Claude is idle
 LOOP_DEFAULT_INTERVAL = 1800 # 30 minutes
 LOOP_DEADLINE_FILE = "/tmp/claudius-loop-deadline"
+LOOP_RELOAD_POLL = 2.0       # seconds between LOOP.md mtime checks
+
+# inotify events that can mean LOOP.md changed: written, created, removed, renamed
+INOTIFY_MASK = 0x008 | 0x040 | 0x080 | 0x100 | 0x200  # CLOSE_WRITE|MOVED_FROM|MOVED_TO|CREATE|DELETE
+
+
+# ─── QUEUE — spool-directory prompt queue ──────────────────────────
+# When the "queue" modifier is active, other tools drop prompt files into
+# a host-mounted spool directory and we type them into Claude one at a
+# time, whenever Claude goes idle. Each prompt moves through three
+# directories, which doubles as the acknowledgement protocol:
+#   incoming/<name>  →  active/<name>  →  done/<name> + done/<name>.result
+# Writers should create files under a dot-prefixed name and rename them
+# into place — dotfiles are ignored until then. An "alive" file in the
+# spool root is touched periodically so the host can tell a running queue
+# from one left behind by a session that died without cleaning up.
+
+QUEUE_DIR = "/tmp/claudius-queue"
+QUEUE_IDLE_THRESHOLD = 30    # seconds of output silence → ready for the next prompt
+QUEUE_POLL_INTERVAL = 1.0    # seconds between spool directory scans
+QUEUE_ALIVE_FILE = os.path.join(QUEUE_DIR, "alive")
+QUEUE_ALIVE_INTERVAL = 30    # seconds between liveness touches (host treats >3 min as stale)
+
+
+def queue_path(state, name=""):
+    """Path of a queue entry in the given state directory."""
+    return os.path.join(QUEUE_DIR, state, name)
+
+
+def touch_queue_alive():
+    """Refresh the spool directory's liveness file."""
+    try:
+        with open(QUEUE_ALIVE_FILE, "w") as f:
+            f.write(f"{time.time():.0f}\n")
+    except OSError:
+        pass
+
+
+def next_queued_prompt():
+    """
+    Return (name, prompt) for the oldest file in incoming/, or None.
+
+    Files are ordered by mtime, then name, so writers that don't control
+    naming still get FIFO behaviour. Empty files are retired immediately.
+    """
+    try:
+        entries = os.listdir(queue_path("incoming"))
+    except OSError:
+        return None
+
+    candidates = []
+    for name in entries:
+        if name.startswith("."):
+            continue
+        try:
+            st = os.stat(queue_path("incoming", name))
+        except OSError:
+            continue
+        if os.path.isfile(queue_path("incoming", name)):
+            candidates.append((st.st_mtime_ns, name))
+
+    for _, name in sorted(candidates):
+        try:
+            with open(queue_path("incoming", name), "r") as f:
+                prompt = f.read().strip()
+        except (OSError, IOError, UnicodeDecodeError):
+            continue
+        if prompt:
+            return (name, prompt)
+        finish_queued_prompt(name, "incoming", "empty", None)
+
+    return None
+
+
+def finish_queued_prompt(name, state, status, sent_at):
+    """Move a queue entry to done/ and write its result marker."""
+    try:
+        os.rename(queue_path(state, name), queue_path("done", name))
+    except OSError:
+        pass
+
+    now = time.time()
+    result = {"status": status, "sent_at": sent_at, "finished_at": now}
+    if sent_at is not None:
+        result["duration"] = round(now - sent_at, 2)
+
+    # Write via rename so pollers never read a half-written marker
+    marker = queue_path("done", name + ".result")
+    try:
+        with open(queue_path("done", "." + name + ".result"), "w") as f:
+            json.dump(result, f)
+            f.write("\n")
+        os.rename(queue_path("done", "." + name + ".result"), marker)
+    except OSError:
+        pass
+
+
+# ─── THROTTLE — usage-aware loop pacing ───────────────────────────
+# Unattended loops and queues read the five-hour usage window from the
+# cache shared by all containers (maintained by usage.sh, host-mounted
+# from ~/.claudius/usage). When usage runs ahead of an even pace through
+# the window, interval waits are stretched. Near the cap, sending pauses
+# until the window resets, and concurrent sessions resume staggered so
+# they don't all fire the moment the budget refills.
+# Set CLAUDIUS_THROTTLE=0 to disable.
+
+THROTTLE_MODE = os.environ.get("CLAUDIUS_THROTTLE", "1") != "0"
+USAGE_HELPER = "/usr/local/bin/usage.sh"
+USAGE_DIR = os.environ.get("CLAUDIUS_USAGE_DIR", "/tmp")
+USAGE_FILE = os.path.join(USAGE_DIR, "usage.json")
+USAGE_SESSIONS_DIR = os.path.join(USAGE_DIR, "sessions")
+USAGE_POLL_INTERVAL = 30      # seconds between usage cache reads
+USAGE_MAX_AGE = 600           # ignore cached usage older than this
+USAGE_WINDOW = 5 * 3600       # length of the usage window being paced
+USAGE_SOFT_THRESHOLD = 30     # % — below this, never stretch
+USAGE_PAUSE_THRESHOLD = 90    # % — at or above this, pause until reset
+USAGE_MAX_STRETCH = 8.0       # cap on the interval multiplier
+USAGE_RESUME_STAGGER = 60     # seconds between sessions resuming after a reset
+HEARTBEAT_STALE = 180         # seconds before a session heartbeat is ignored
+
+
+def refresh_usage(proc):
+    """
+    Kick off usage.sh in the background unless a previous run is still going.
+
+    Returns the running Popen (or None). Never blocks the PTY loop — the
+    refreshed cache is picked up on the next poll.
+    """
+    if proc is not None and proc.poll() is None:
+        return proc
+    try:
+        return subprocess.Popen(
+            ["bash", USAGE_HELPER],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+
+def read_usage():
+    """Return the cached usage dict, or None if missing, malformed or stale."""
+    try:
+        with open(USAGE_FILE, "r") as f:
+            usage = json.load(f)
+        utilization = float(usage["utilization"])
+        fetched_at = float(usage.get("fetched_at") or 0)
+    except (OSError, IOError, ValueError, KeyError, TypeError):
+        return None
+    if time.time() - fetched_at > USAGE_MAX_AGE:
+        return None
+    resets_at = usage.get("resets_at")
+    return {
+        "utilization": utilization,
+        "resets_at": float(resets_at) if isinstance(resets_at, (int, float)) else None,
+    }
+
+
+def touch_heartbeat(name):
+    """Mark this session as actively looping in the shared sessions directory."""
+    try:
+        os.makedirs(USAGE_SESSIONS_DIR, exist_ok=True)
+        with open(os.path.join(USAGE_SESSIONS_DIR, name), "w") as f:
+            f.write(f"{time.time():.0f}\n")
+    except OSError:
+        pass
+
+
+def remove_heartbeat(name):
+    """Remove this session's heartbeat on exit."""
+    try:
+        os.unlink(os.path.join(USAGE_SESSIONS_DIR, name))
+    except OSError:
+        pass
+
+
+def session_slot(name):
+    """This session's position among live heartbeats, so resumes can be staggered."""
+    live = []
+    try:
+        for entry in os.listdir(USAGE_SESSIONS_DIR):
+            try:
+                mtime = os.stat(os.path.join(USAGE_SESSIONS_DIR, entry)).st_mtime
+            except OSError:
+                continue
+            if time.time() - mtime <= HEARTBEAT_STALE:
+                live.append(entry)
+    except OSError:
+        return 0
+    live.sort()
+    return live.index(name) if name in live else 0
+
+
+def compute_throttle(usage, slot):
+    """
+    Turn a usage reading into (stretch, pause_until).
+
+    stretch multiplies interval waits: it's how far utilization is ahead
+    of an even pace towards the pause threshold over the window (1.0 when
+    on pace or behind). pause_until is a wall-clock epoch before which
+    nothing should be sent (0.0 when not paused).
+    """
+    if usage is None or usage["resets_at"] is None:
+        return (1.0, 0.0)
+
+    now = time.time()
+    utilization = usage["utilization"]
+    if utilization >= USAGE_PAUSE_THRESHOLD:
+        # Hold until the reset plus this session's stagger slot
+        pause_until = usage["resets_at"] + slot * USAGE_RESUME_STAGGER
+        if pause_until > now:
+            return (1.0, pause_until)
+
+    until_reset = usage["resets_at"] - now
+    if until_reset <= 0:
+        # Window already rolled over — the reading is from the old window
+        return (1.0, 0.0)
+
+    if utilization < USAGE_SOFT_THRESHOLD:
+        return (1.0, 0.0)
+
+    elapsed = max(USAGE_WINDOW - until_reset, 1.0)
+    on_pace = USAGE_PAUSE_THRESHOLD * min(elapsed / USAGE_WINDOW, 1.0)
+    stretch = min(USAGE_MAX_STRETCH, max(1.0, utilization / on_pace))
+    return (round(stretch, 1), 0.0)
 
 
 def strip_ansi(text):
@@ -177,7 +410,9 @@ def parse_interval_line(line):
                           4 hours, then do X  →  14400
                           30 seconds  →  30
 
-    Returns seconds (int) or None if no interval found.
+    Returns seconds (int) or None if no interval found. Raises ValueError
+    for a cron schedule other than */N minutes or N */H hours, which the
+    loop can't run.
     """
     line = line.strip()
     if not line:
@@ -199,8 +434,12 @@ def parse_interval_line(line):
                 m = re.match(r'^\*/(\d+)$', hour)
                 if m:
                     return int(m.group(1)) * 3600
-            # Other valid cron → default interval (caller decides)
-            return None
+            # Other cron schedules (fixed times of day, weekdays...) can't be
+            # expressed as a repeat interval — reject rather than guess
+            raise ValueError(
+                f"unsupported cron schedule '{' '.join(fields[:5])}' "
+                f"(use */N * * * * or M */H * * *)"
+            )
 
     # ── Human-readable: look for a number followed by a time unit ──
     m = re.search(
@@ -253,12 +492,25 @@ def parse_delimiter(line):
     return ("timed", seconds)
 
 
-def parse_loop_blocks(text):
+# A compiled loop block. payload is the exact bytes typed into the PTY,
+# encoded once at compile time instead of on every send.
+LoopBlock = collections.namedtuple("LoopBlock", "prompt payload wait_type wait_seconds")
+
+# Lines that look like a delimiter (=== followed by a spec, no spaces) but
+# don't parse as one are reported instead of being sent as prompt text.
+DELIMITER_LIKE_RE = re.compile(r'^={3,}\S+$')
+
+
+def make_loop_block(prompt, wait_type, wait_seconds):
+    """Build a LoopBlock with its PTY payload precomputed."""
+    return LoopBlock(prompt, prompt.encode("utf-8") + b"\r", wait_type, wait_seconds)
+
+
+def parse_loop_blocks(text, first_lineno=1):
     """
-    Split text by === delimiters into a list of loop blocks.
+    Split text by === delimiters into a tuple of compiled LoopBlocks.
 
-    Each block is (prompt, wait_type, wait_seconds) where wait_type/wait_seconds
-    describe the wait condition AFTER sending this block, before the next one.
+    Each block carries the wait condition AFTER sending it, before the next one.
 
     Wait types:
       "interval" — bare === or last block: wait the global loop interval
@@ -267,18 +519,25 @@ def parse_loop_blocks(text):
 
     The last block (no trailing delimiter) gets ("interval", None) — wraps
     around using the global interval.
+
+    Raises ValueError (with the offending line number) on malformed or
+    zero-length delimiters. first_lineno is the file line number of text[0].
     """
     lines = text.split("\n")
     blocks = []
     current_lines = []
 
-    for line in lines:
+    for lineno, line in enumerate(lines, first_lineno):
         delim = parse_delimiter(line)
+        if delim is None and DELIMITER_LIKE_RE.match(line.strip()):
+            raise ValueError(f"line {lineno}: unrecognised delimiter {line.strip()!r}")
         if delim is not None:
+            if delim[0] == "timed" and delim[1] <= 0:
+                raise ValueError(f"line {lineno}: wait must be longer than zero")
             # Finalize the accumulated block with this delimiter's wait spec
             prompt = "\n".join(current_lines).strip()
             if prompt:
-                blocks.append((prompt, delim[0], delim[1]))
+                blocks.append(make_loop_block(prompt, delim[0], delim[1]))
             current_lines = []
         else:
             current_lines.append(line)
@@ -286,9 +545,9 @@ def parse_loop_blocks(text):
     # Last block — wrap-around uses the global interval (same as bare ===)
     prompt = "\n".join(current_lines).strip()
     if prompt:
-        blocks.append((prompt, "interval", None))
+        blocks.append(make_loop_block(prompt, "interval", None))
 
-    return blocks
+    return tuple(blocks)
 
 
 def find_loop_file():
@@ -311,47 +570,136 @@ def find_loop_file():
     return None
 
 
-def parse_loop_file(path):
+def load_loop_program(path):
     """
-    Read LOOP.md and extract (global_interval, blocks).
+    Read LOOP.md and compile it into a program: (global_interval, blocks).
 
-    blocks is a list of (prompt, wait_type, wait_seconds) tuples. The global
-    interval applies to idle waits that don't specify their own duration.
+    blocks is a tuple of LoopBlocks. The global interval applies to
+    "interval" waits and to idle waits that don't specify their own duration.
 
-    Returns None if the file doesn't exist, is empty, or has no usable blocks.
+    Returns (program, None) on success or (None, error_message) when the
+    file is missing, unreadable, empty or malformed.
     """
     if path is None:
-        return None
+        return (None, "no LOOP.md found")
 
     try:
         with open(path, "r") as f:
             content = f.read()
-    except (OSError, IOError):
-        return None
+    except (OSError, IOError, UnicodeDecodeError) as e:
+        return (None, f"cannot read {path}: {e}")
 
     if not content.strip():
-        return None
+        return (None, "file is empty")
 
     lines = content.split("\n")
     first_line = lines[0]
-    interval = parse_interval_line(first_line)
+    try:
+        interval = parse_interval_line(first_line)
+    except ValueError as e:
+        return (None, f"line 1: {e}")
 
     if interval is not None:
+        if interval <= 0:
+            return (None, "line 1: interval must be longer than zero")
         # First line was an interval spec — content is the rest
-        remaining = "\n".join(lines[1:]).strip()
+        remaining = "\n".join(lines[1:])
+        first_lineno = 2
     else:
         # First line is not an interval — entire file is content
-        remaining = content.strip()
+        remaining = content
+        first_lineno = 1
         interval = LOOP_DEFAULT_INTERVAL
 
-    if not remaining:
-        return None
+    try:
+        blocks = parse_loop_blocks(remaining, first_lineno)
+    except ValueError as e:
+        return (None, str(e))
 
-    blocks = parse_loop_blocks(remaining)
     if not blocks:
+        return (None, "no prompts found")
+
+    return ((interval, blocks), None)
+
+
+def loop_file_signature(path):
+    """Identity of the current LOOP.md contents: (path, inode, size, mtime)."""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def open_loop_watch():
+    """
+    Watch the LOOP.md directories with inotify (via libc) for instant reloads.
+
+    Returns a non-blocking inotify fd, or None when inotify is unavailable.
+    Callers must still poll loop_file_signature() — edits made on the host
+    don't always produce inotify events through Docker Desktop bind mounts.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+
+    watched = 0
+    for directory in ("/workspace", os.path.expanduser("~/.agents")):
+        if os.path.isdir(directory) and libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_MASK) >= 0:
+            watched += 1
+
+    if not watched:
+        os.close(fd)
         return None
+    return fd
+
+
+def drain_loop_watch(fd):
+    """Consume pending inotify events. True if anything changed."""
+    changed = False
+    while True:
+        try:
+            if not os.read(fd, 4096):
+                break
+            changed = True
+        except BlockingIOError:
+            break
+        except OSError:
+            break
+    return changed
+
+
+def rebase_loop_position(old_blocks, index, new_blocks):
+    """
+    Map the next-block index of the old program onto a reloaded one.
 
-    return (interval, blocks)
+    Stays put if the upcoming block is unchanged, follows it if it moved,
+    and otherwise keeps the same index (wrapping to 0 if out of range).
+    """
+    if not old_blocks or index >= len(old_blocks):
+        return 0
+    target = old_blocks[index].prompt
+    if index < len(new_blocks) and new_blocks[index].prompt == target:
+        return index
+    for j, block in enumerate(new_blocks):
+        if block.prompt == target:
+            return j
+    return index if index < len(new_blocks) else 0
+
+
+def wait_before_block(blocks, index):
+    """The wait condition preceding blocks[index] (set by the previous block)."""
+    if index == 0:
+        # Both the initial send and the wrap-around use the global interval
+        return ("interval", None)
+    previous = blocks[index - 1]
+    return (previous.wait_type, previous.wait_seconds)
 
 
 def format_interval(seconds):
@@ -378,16 +726,30 @@ def format_hms(seconds):
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
-def write_loop_deadline(wait_type, wait_seconds, loop_interval):
-    """Write the next-fire wall-clock deadline for the statusline countdown."""
+def write_loop_deadline(wait_type, wait_seconds, loop_interval, elapsed=0.0, error=None, not_before=0.0):
+    """
+    Write the next-fire wall-clock deadline for the statusline countdown.
+
+    First line: epoch deadline, "idle", or "paused" (wait_type None — no
+    usable program). An optional second line carries a LOOP.md error.
+    elapsed is time already waited, so a reload doesn't restart the countdown.
+    not_before is a usage-throttle pause epoch the deadline can't precede.
+    """
     try:
-        if wait_type == "idle":
+        if wait_type is None:
+            content = "paused\n"
+        elif wait_type == "idle" and not_before <= time.time():
             # Can't predict when idle will trigger — signal it
             content = "idle\n"
         else:
-            delay = wait_seconds if wait_type == "timed" else loop_interval
-            deadline = time.time() + delay
+            if wait_type == "idle":
+                deadline = not_before
+            else:
+                delay = wait_seconds if wait_type == "timed" else loop_interval
+                deadline = max(time.time() + delay - elapsed, not_before)
             content = f"{deadline:.2f}\n"
+        if error:
+            content += f"error: {error}\n"
         with open(LOOP_DEADLINE_FILE, "w") as f:
             f.write(content)
     except OSError:
@@ -458,9 +820,12 @@ def main():
     log.debug("stdin_is_tty=%s", stdin_is_tty)
 
     # ── Loop detection (before fork, while terminal is still cooked) ──
-    loop_config = None
-    loop_interval = None
-    loop_blocks = None
+    loop_interval = LOOP_DEFAULT_INTERVAL
+    loop_blocks = ()
+    # LOOP.md hot-reload state: only file-based loops are watched
+    loop_watching = False
+    loop_signature = None
+    loop_error = None
 
     if LOOP_MODE:
         # Inline prompt from env var takes priority over LOOP.md file
@@ -468,28 +833,42 @@ def main():
         if env_prompt:
             env_interval = os.environ.get("CLAUDIUS_LOOP_INTERVAL", "")
             loop_interval = int(env_interval) if env_interval else LOOP_DEFAULT_INTERVAL
-            loop_blocks = [(env_prompt, "idle", None)]
-            loop_config = (loop_interval, loop_blocks)
+            loop_blocks = (make_loop_block(env_prompt, "idle", None),)
             print(
                 f"\r🔄 Looping inline prompt every "
                 f"{format_hms(loop_interval)}\r\n",
                 end="", flush=True,
             )
         else:
+            loop_watching = True
             _loop_path = find_loop_file()
-            loop_config = parse_loop_file(_loop_path)
-            if loop_config:
-                loop_interval, loop_blocks = loop_config
+            loop_signature = loop_file_signature(_loop_path)
+            _program, loop_error = load_loop_program(_loop_path)
+            if _program:
+                loop_interval, loop_blocks = _program
                 _source = "~/.agents/LOOP.md" if "/.agents/" in (_loop_path or "") else "./LOOP.md"
                 _block_info = f" ({len(loop_blocks)} blocks)" if len(loop_blocks) > 1 else ""
                 print(
                     f"\r🔄 Looping {_source}{_block_info} every "
-                    f"{format_hms(loop_interval)}\r\n",
+                    f"{format_hms(loop_interval)} (reloads on change)\r\n",
+                    end="", flush=True,
+                )
+            else:
+                print(
+                    f"\r⚠ LOOP.md: {loop_error} — waiting for a valid file\r\n",
                     end="", flush=True,
                 )
 
-        if loop_config:
-            log.debug("LOOP: interval=%ds, blocks=%d", loop_interval, len(loop_blocks))
+        log.debug("LOOP: interval=%ds, blocks=%d, error=%s", loop_interval, len(loop_blocks), loop_error)
+
+    if QUEUE_MODE:
+        for _state in ("incoming", "active", "done"):
+            try:
+                os.makedirs(queue_path(_state), exist_ok=True)
+            except OSError:
+                pass
+        print("\r📥 Queue: watching for prompts\r\n", end="", flush=True)
+        log.debug("QUEUE: watching %s", queue_path("incoming"))
 
     # Save original terminal settings so we can restore on exit
     old_termios = None
@@ -545,15 +924,41 @@ def main():
     loop_block_index = 0
     # Use the global interval for the initial block so it fires after
     # loop_interval seconds instead of waiting for the 120s idle threshold.
-    loop_wait_type = "interval" if loop_blocks else "idle"
-    loop_wait_seconds = None
+    loop_wait_type, loop_wait_seconds = wait_before_block(loop_blocks, 0)
+
+    # Watch LOOP.md for edits — inotify for instant reloads, mtime polling
+    # as the fallback (and for host edits that never reach inotify)
+    loop_watch_fd = open_loop_watch() if loop_watching else None
+    last_loop_reload_check = time.monotonic()
+
+    # Queue state — the prompt currently being worked on (name, wall-clock sent time)
+    queue_active = None
+    last_queue_prompt_time = 0.0
+    last_queue_poll = 0.0
+    last_queue_alive = -QUEUE_ALIVE_INTERVAL
+
+    # Usage throttle — interval multiplier and wall-clock pause, refreshed
+    # from the shared usage cache every USAGE_POLL_INTERVAL seconds
+    throttling = THROTTLE_MODE and (LOOP_MODE or QUEUE_MODE)
+    throttle_name = socket.gethostname()
+    throttle_stretch = 1.0
+    throttle_pause_until = 0.0
+    throttle_utilization = None
+    usage_proc = None
+    last_usage_poll = -USAGE_POLL_INTERVAL
+    if throttling:
+        log.debug("THROTTLE: enabled (session=%s, usage=%s)", throttle_name, USAGE_FILE)
 
     # Terminal title countdown — updates every second for real-time feedback
     last_title_update = 0.0
+    last_title_status = ""
 
     # Write the initial deadline so the statusline can start counting down
-    if LOOP_MODE and loop_blocks:
-        write_loop_deadline(loop_wait_type, loop_wait_seconds, loop_interval)
+    if LOOP_MODE:
+        write_loop_deadline(
+            loop_wait_type if loop_blocks else None,
+            loop_wait_seconds, loop_interval, error=loop_error,
+        )
 
     # Build the list of fds to select on
     read_fds = [master_fd]
@@ -661,8 +1066,85 @@ def main():
                         # Clear the buffer so we don't re-trigger on residual text
                         output_buffer = ""
 
+            # ── Loop: hot-reload LOOP.md when it changes ──
+            if loop_watching:
+                now = time.monotonic()
+                notified = loop_watch_fd is not None and drain_loop_watch(loop_watch_fd)
+                if notified or now - last_loop_reload_check >= LOOP_RELOAD_POLL:
+                    last_loop_reload_check = now
+                    _loop_path = find_loop_file()
+                    _signature = loop_file_signature(_loop_path)
+                    if _signature != loop_signature:
+                        loop_signature = _signature
+                        _program, loop_error = load_loop_program(_loop_path)
+                        if _program:
+                            new_interval, new_blocks = _program
+                            if not loop_blocks:
+                                # Loop was paused — start the first wait from now
+                                last_loop_prompt_time = now
+                            # Swap in the new program, keeping our place where blocks still match
+                            loop_block_index = rebase_loop_position(loop_blocks, loop_block_index, new_blocks)
+                            loop_wait_type, loop_wait_seconds = wait_before_block(new_blocks, loop_block_index)
+                            loop_interval, loop_blocks = new_interval, new_blocks
+                            log.debug(
+                                "LOOP: reloaded %s (interval=%ds, blocks=%d, next=%d)",
+                                _loop_path, loop_interval, len(loop_blocks), loop_block_index + 1,
+                            )
+                        elif _loop_path is None:
+                            # LOOP.md was removed — pause until one shows up again
+                            loop_blocks = ()
+                            loop_block_index = 0
+                            log.debug("LOOP: no LOOP.md — paused")
+                        else:
+                            # Broken edit — keep running the last good program
+                            log.debug("LOOP: reload failed (%s) — keeping previous program", loop_error)
+
+                        write_loop_deadline(
+                            loop_wait_type if loop_blocks else None,
+                            loop_wait_seconds, loop_interval * throttle_stretch,
+                            elapsed=now - last_loop_prompt_time, error=loop_error,
+                            not_before=throttle_pause_until,
+                        )
+                        last_title_update = 0.0  # refresh the title right away
+
+            # ── Throttle: pace unattended prompts against the usage window ──
+            if throttling:
+                now = time.monotonic()
+                if now - last_usage_poll >= USAGE_POLL_INTERVAL:
+                    last_usage_poll = now
+                    # Refresh in the background — this poll reads the previous result
+                    usage_proc = refresh_usage(usage_proc)
+                    touch_heartbeat(throttle_name)
+                    usage = read_usage()
+                    _slot = session_slot(throttle_name)
+                    _throttle = compute_throttle(usage, _slot)
+                    if time.time() < throttle_pause_until:
+                        # A pause, once set, holds until its staggered resume time.
+                        # Right after the reset the cache shows low usage, and
+                        # recomputing would release every slot at once.
+                        _throttle = (_throttle[0], max(_throttle[1], throttle_pause_until))
+                    else:
+                        throttle_utilization = usage["utilization"] if usage else None
+                    if _throttle != (throttle_stretch, throttle_pause_until):
+                        throttle_stretch, throttle_pause_until = _throttle
+                        log.debug(
+                            "THROTTLE: usage=%s%% stretch=%.1f pause_until=%.0f slot=%d",
+                            throttle_utilization, throttle_stretch, throttle_pause_until, _slot,
+                        )
+                        if LOOP_MODE:
+                            write_loop_deadline(
+                                loop_wait_type if loop_blocks else None,
+                                loop_wait_seconds, loop_interval * throttle_stretch,
+                                elapsed=now - last_loop_prompt_time, error=loop_error,
+                                not_before=throttle_pause_until,
+                            )
+                        last_title_update = 0.0
+            throttle_paused = time.time() < throttle_pause_until
+
             # ── Loop: step through blocks and re-prompt Claude ──
-            if LOOP_MODE and loop_blocks:
+            # Hold the loop while a queued prompt is still being worked on,
+            # so the two never type over each other or share a .result timing
+            if LOOP_MODE and loop_blocks and not throttle_paused and queue_active is None:
                 now = time.monotonic()
                 idle = now - last_child_output_time
                 since_prompt = now - last_loop_prompt_time
@@ -674,11 +1156,15 @@ def main():
                     # Fixed delay — just wait the specified seconds
                     should_send = since_prompt >= loop_wait_seconds
                 elif loop_wait_type == "interval":
-                    # Bare === separator — wait the global interval (timed, not idle)
-                    should_send = since_prompt >= loop_interval
+                    # Bare === separator — wait the global interval (timed, not idle),
+                    # stretched when usage is running ahead of pace
+                    should_send = since_prompt >= loop_interval * throttle_stretch
                 else:
                     # Explicit ===idle=== — Claude must be idle + minimum interval elapsed
-                    min_interval = loop_wait_seconds if loop_wait_seconds is not None else loop_interval
+                    min_interval = (
+                        loop_wait_seconds if loop_wait_seconds is not None
+                        else loop_interval * throttle_stretch
+                    )
                     should_send = (
                         idle >= LOOP_IDLE_THRESHOLD
                         and since_prompt >= min_interval
@@ -686,7 +1172,7 @@ def main():
                     )
 
                 if should_send:
-                    prompt, next_wait_type, next_wait_seconds = loop_blocks[loop_block_index]
+                    block = loop_blocks[loop_block_index]
                     log.debug(
                         "LOOP: sending block %d/%d (idle=%.0fs, wait=%s/%s)",
                         loop_block_index + 1, len(loop_blocks),
@@ -694,33 +1180,101 @@ def main():
                         f"{loop_wait_seconds}s" if loop_wait_seconds else "global",
                     )
                     try:
-                        os.write(master_fd, prompt.encode("utf-8") + b"\r")
+                        os.write(master_fd, block.payload)
                     except OSError:
                         pass
                     last_loop_prompt_time = now
                     output_buffer = ""
 
                     # Advance to next block and set its wait condition
-                    loop_wait_type = next_wait_type
-                    loop_wait_seconds = next_wait_seconds
+                    loop_wait_type = block.wait_type
+                    loop_wait_seconds = block.wait_seconds
                     loop_block_index = (loop_block_index + 1) % len(loop_blocks)
 
                     # Update the deadline for the statusline countdown
-                    write_loop_deadline(loop_wait_type, loop_wait_seconds, loop_interval)
+                    write_loop_deadline(
+                        loop_wait_type, loop_wait_seconds, loop_interval * throttle_stretch,
+                        error=loop_error,
+                    )
 
-                # ── Live countdown in terminal title (updates every second) ──
+            # ── Live countdown in terminal title (updates every second) ──
+            # Queue-only sessions have no countdown, but still show a usage pause
+            if LOOP_MODE or throttling:
+                now = time.monotonic()
                 if now - last_title_update >= 1.0:
                     last_title_update = now
-                    if loop_wait_type == "idle":
-                        _title = "\033]0;⏱ idle\007"
+                    _pause_status = ""
+                    if throttle_paused:
+                        _resume = time.strftime("%H:%M", time.localtime(throttle_pause_until))
+                        _pause_status = f"⏸ usage {throttle_utilization:.0f}% until {_resume}"
+                    if not LOOP_MODE:
+                        _status = _pause_status
+                    elif not loop_blocks:
+                        _status = "⏸ paused"
+                    elif throttle_paused:
+                        _status = _pause_status
+                    elif loop_wait_type == "idle":
+                        _status = "⏱ idle"
                     else:
-                        _delay = loop_wait_seconds if loop_wait_type == "timed" else loop_interval
+                        _delay = loop_wait_seconds if loop_wait_type == "timed" else loop_interval * throttle_stretch
                         _remaining = max(0, int(_delay - (now - last_loop_prompt_time)))
-                        _title = f"\033]0;⏱ {format_hms(_remaining)}\007"
-                    try:
-                        os.write(stdout_fd, _title.encode())
-                    except OSError:
-                        pass
+                        _status = f"⏱ {format_hms(_remaining)}"
+                    if LOOP_MODE and throttle_stretch > 1.0 and not throttle_paused:
+                        _status += f" ×{throttle_stretch:.1f}"
+                    # Surface LOOP.md problems where the user is already looking
+                    if loop_error:
+                        _status += f" ⚠ LOOP.md: {loop_error}"
+                    # Only rewrite on change, so queue-only sessions leave the title alone until paused
+                    if _status != last_title_status:
+                        last_title_status = _status
+                        try:
+                            os.write(stdout_fd, f"\033]0;{_status}\007".encode())
+                        except OSError:
+                            pass
+
+            # ── Queue: inject spooled prompts when Claude is idle ──
+            if QUEUE_MODE:
+                now = time.monotonic()
+                # Keep the liveness file fresh whether or not we're idle
+                if now - last_queue_alive >= QUEUE_ALIVE_INTERVAL:
+                    last_queue_alive = now
+                    touch_queue_alive()
+                # A loop prompt sent this tick hasn't produced output yet —
+                # wait out its own idle window before treating Claude as free
+                ready = (
+                    now - last_child_output_time >= QUEUE_IDLE_THRESHOLD
+                    and now - last_user_input_time >= QUEUE_IDLE_THRESHOLD
+                    and now - last_queue_prompt_time >= QUEUE_IDLE_THRESHOLD
+                    and (not LOOP_MODE or now - last_loop_prompt_time >= QUEUE_IDLE_THRESHOLD)
+                    and now - last_queue_poll >= QUEUE_POLL_INTERVAL
+                )
+                if ready:
+                    last_queue_poll = now
+
+                    # Claude went quiet after the last queued prompt — it's done
+                    if queue_active is not None:
+                        log.debug("QUEUE: finished %s", queue_active[0])
+                        finish_queued_prompt(queue_active[0], "active", "done", queue_active[1])
+                        queue_active = None
+
+                    # A usage pause only holds back new prompts, never the result above
+                    queued = None if throttle_paused else next_queued_prompt()
+                    if queued is not None:
+                        name, prompt = queued
+                        try:
+                            # Moving into active/ acknowledges the pickup
+                            os.rename(queue_path("incoming", name), queue_path("active", name))
+                        except OSError:
+                            log.debug("QUEUE: could not claim %s — skipping", name)
+                        else:
+                            log.debug("QUEUE: sending %s (%d chars)", name, len(prompt))
+                            try:
+                                os.write(master_fd, prompt.encode("utf-8") + b"\r")
+                            except OSError:
+                                pass
+                            queue_active = (name, time.time())
+                            last_queue_prompt_time = now
+                            output_buffer = ""
 
     except StopIteration:
         pass
@@ -736,12 +1290,22 @@ def main():
         if old_termios is not None:
             termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_termios)
         # Clear the terminal title and deadline file
-        if LOOP_MODE:
+        if LOOP_MODE or last_title_status:
             try:
                 os.write(stdout_fd, b"\033]0;\007")
             except OSError:
                 pass
         clear_loop_deadline()
+        if loop_watch_fd is not None:
+            try:
+                os.close(loop_watch_fd)
+            except OSError:
+                pass
+        # A prompt still in flight when Claude exits never got its result
+        if queue_active is not None:
+            finish_queued_prompt(queue_active[0], "active", "interrupted", queue_active[1])
+        if throttling:
+            remove_heartbeat(throttle_name)
 
     # Wait for the child and propagate its exit code
     while True:
@@ -15,9 +15,10 @@ if [ "${CLAUDIUS_NM_ISOLATED:-0}" = "1" ] && [ -d /workspace/node_modules ]; the
     sudo chown -R node:node /workspace/node_modules 2>/dev/null || true
 fi
 
-# Wrap through auto-accept.py when yolo (plan auto-accept) or loop
-# (periodic re-prompting) is active. Autopilot only manages tmux.
-if [ "${CLAUDIUS_YOLO:-}" = "1" ] || [ "${CLAUDIUS_LOOP:-}" = "1" ]; then
+# Wrap through auto-accept.py when yolo (plan auto-accept), loop
+# (periodic re-prompting) or queue (spooled prompts) is active.
+# Background only manages tmux.
+if [ "${CLAUDIUS_YOLO:-}" = "1" ] || [ "${CLAUDIUS_LOOP:-}" = "1" ] || [ "${CLAUDIUS_QUEUE:-}" = "1" ]; then
     exec python3 /usr/local/bin/auto-accept.py "$@"
 else
     exec "$@"
@@ -4,7 +4,7 @@
 #
 # A Linux-compatible rewrite of the host's statusline-command.sh.
 # Uses curl (not swift) and GNU date (not BSD date).
-# Reads CLAUDE_SESSION_KEY and CLAUDE_ORG_ID from env vars.
+# Usage comes from the shared cache maintained by usage.sh.
 # -----------------------------------------------------------
 
 # Display toggles — all enabled by default, fully self-contained
@@ -55,9 +55,11 @@ if [ "$show_modifiers" = "1" ]; then
         # Append countdown after "loop" modifier — reads deadline from auto-accept.py
         _deadline_file="/tmp/claudius-loop-deadline"
         if [ -f "$_deadline_file" ]; then
-            _deadline=$(cat "$_deadline_file" 2>/dev/null)
-            if [ "$_deadline" = "idle" ]; then
-                _li_fmt="idle"
+            # Line 1: deadline / idle / paused — line 2 (optional): LOOP.md error
+            _deadline=$(head -n 1 "$_deadline_file" 2>/dev/null)
+            _loop_error=$(sed -n '2s/^error: //p' "$_deadline_file" 2>/dev/null)
+            if [ "$_deadline" = "idle" ] || [ "$_deadline" = "paused" ]; then
+                _li_fmt="$_deadline"
             elif [ -n "$_deadline" ]; then
                 # Wall-clock deadline — compare with current epoch
                 _now=$(date +%s)
@@ -67,6 +69,7 @@ if [ "$show_modifiers" = "1" ]; then
                 _ls=$(( _remaining % 60 ))
                 _li_fmt=$(printf '%02d:%02d:%02d' $_lh $_lm $_ls)
             fi
+            [ -n "${_loop_error:-}" ] && _li_fmt="${_li_fmt:+${_li_fmt} }${YELLOW}⚠ ${_loop_error:0:40}${MAGENTA}"
             [ -n "${_li_fmt:-}" ] && mod_display="${mod_display/loop/loop ${_li_fmt}}"
         elif [ -n "${CLAUDIUS_LOOP_INTERVAL:-}" ]; then
             # Fallback: show static interval if no deadline file yet
@@ -110,22 +113,20 @@ if [ "$show_branch" = "1" ]; then
     fi
 fi
 
-# ---- usage (via curl) ----
+# ---- usage (via the shared usage.sh cache) ----
 
 usage_text=""
 if [ "$show_usage" = "1" ]; then
 
-    # Graceful degradation: if credentials are missing, show a placeholder
-    if [ -n "$CLAUDE_SESSION_KEY" ] && [ -n "$CLAUDE_ORG_ID" ]; then
+    # Shared cache (refreshed at most once per minute across all containers).
+    # Graceful degradation: without credentials or fresh data the helper prints nothing.
+    usage_json=$(bash /usr/local/bin/usage.sh 2>/dev/null)
+    utilization=$(echo "$usage_json" | jq -r '.utilization // empty | floor' 2>/dev/null)
+    resets_epoch=$(echo "$usage_json" | jq -r '.resets_at // empty' 2>/dev/null)
 
-        api_result=$(curl -s --max-time 5 \
-            -H "Cookie: sessionKey=$CLAUDE_SESSION_KEY" \
-            -H "Accept: application/json" \
-            "https://claude.ai/api/organizations/$CLAUDE_ORG_ID/usage" 2>/dev/null)
-
-        # Parse JSON with jq (available in the container)
-        utilization=$(echo "$api_result" | jq -r '.five_hour.utilization // empty' 2>/dev/null)
-        resets_at=$(echo "$api_result" | jq -r '.five_hour.resets_at // empty' 2>/dev/null)
+    # A reset time in the past means the reading belongs to a finished window
+    if [[ "$resets_epoch" =~ ^[0-9]+$ ]] && [ "$resets_epoch" -le "$(date +%s)" ]; then
+        utilization=""
     fi
 
     if [ -n "$utilization" ] && [ "$utilization" != "null" ]; then
@@ -165,15 +166,9 @@ if [ "$show_usage" = "1" ]; then
 
         # Reset time (GNU date)
         reset_time_display=""
-        if [ "$show_reset" = "1" ] && [ -n "$resets_at" ] && [ "$resets_at" != "null" ]; then
-            # Strip fractional seconds for GNU date compatibility
-            iso_time=$(echo "$resets_at" | sed 's/\.[0-9]*Z$/Z/; s/\.[0-9]*+/+/')
-            epoch=$(date -d "$iso_time" "+%s" 2>/dev/null)
-
-            if [ -n "$epoch" ]; then
-                reset_time=$(date -d "@$epoch" "+%H:%M" 2>/dev/null)
-                [ -n "$reset_time" ] && reset_time_display=$(printf " → Reset: %s" "$reset_time")
-            fi
+        if [ "$show_reset" = "1" ] && [ -n "$resets_epoch" ]; then
+            reset_time=$(date -d "@$resets_epoch" "+%H:%M" 2>/dev/null)
+            [ -n "$reset_time" ] && reset_time_display=$(printf " → Reset: %s" "$reset_time")
         fi
 
         usage_text="${usage_color}Usage: ${utilization}%${progress_bar}${reset_time_display}${RESET}"
@@ -0,0 +1,79 @@
+#!/bin/bash
+# -----------------------------------------------------------
+# usage.sh — shared, cached Claude usage signal for containers
+#
+# Prints the five-hour usage window as JSON:
+#   {"utilization": 42, "resets_at": <epoch>, "fetched_at": <epoch>}
+# Prints nothing when the cache is older than USAGE_MAX_AGE (no credentials,
+# an expired session key, or yesterday's cache) rather than stale numbers.
+#
+# The cache lives in $CLAUDIUS_USAGE_DIR, which the claudius host script
+# mounts from ~/.claudius/usage — so every running container shares one
+# cache and the usage endpoint is hit at most once per TTL. Used by
+# statusline.sh (display) and auto-accept.py (loop throttling).
+# Reads CLAUDE_SESSION_KEY and CLAUDE_ORG_ID from env vars.
+# -----------------------------------------------------------
+
+USAGE_DIR="${CLAUDIUS_USAGE_DIR:-/tmp}"
+USAGE_FILE="$USAGE_DIR/usage.json"
+USAGE_TTL="${CLAUDIUS_USAGE_TTL:-60}"
+USAGE_MAX_AGE=600    # matches USAGE_MAX_AGE in auto-accept.py
+
+_now=$(date +%s)
+_fetched_at=$(jq -r '.fetched_at // 0 | floor' "$USAGE_FILE" 2>/dev/null)
+[[ "$_fetched_at" =~ ^[0-9]+$ ]] || _fetched_at=0
+
+# ---- refresh when stale (one fetcher at a time across containers) ----
+
+if [ $(( _now - _fetched_at )) -ge "$USAGE_TTL" ] \
+    && [ -n "$CLAUDE_SESSION_KEY" ] && [ -n "$CLAUDE_ORG_ID" ]; then
+
+    mkdir -p "$USAGE_DIR" 2>/dev/null
+
+    # mkdir is atomic — reclaim locks left by a fetcher that died mid-request
+    _lock="$USAGE_FILE.lock"
+    if ! mkdir "$_lock" 2>/dev/null; then
+        if [ -n "$(find "$_lock" -maxdepth 0 -mmin +1 2>/dev/null)" ]; then
+            rmdir "$_lock" 2>/dev/null
+            mkdir "$_lock" 2>/dev/null || _lock=""
+        else
+            _lock=""
+        fi
+    fi
+
+    if [ -n "$_lock" ]; then
+
+        api_result=$(curl -s --max-time 5 \
+            -H "Cookie: sessionKey=$CLAUDE_SESSION_KEY" \
+            -H "Accept: application/json" \
+            "https://claude.ai/api/organizations/$CLAUDE_ORG_ID/usage" 2>/dev/null)
+
+        utilization=$(echo "$api_result" | jq -r '.five_hour.utilization // empty' 2>/dev/null)
+        resets_at=$(echo "$api_result" | jq -r '.five_hour.resets_at // empty' 2>/dev/null)
+
+        if [ -n "$utilization" ] && [ "$utilization" != "null" ]; then
+
+            # Convert the ISO reset time to epoch (strip fractional seconds for GNU date)
+            resets_epoch="null"
+            if [ -n "$resets_at" ] && [ "$resets_at" != "null" ]; then
+                iso_time=$(echo "$resets_at" | sed 's/\.[0-9]*Z$/Z/; s/\.[0-9]*+/+/')
+                resets_epoch=$(date -d "$iso_time" "+%s" 2>/dev/null || echo null)
+            fi
+
+            # Write via rename so concurrent readers never see a partial file
+            _tmp="$USAGE_FILE.$$"
+            if jq -n --argjson u "$utilization" --argjson r "$resets_epoch" --argjson f "$_now" \
+                '{utilization: $u, resets_at: $r, fetched_at: $f}' > "$_tmp" 2>/dev/null; then
+                mv "$_tmp" "$USAGE_FILE"
+            else
+                rm -f "$_tmp"
+            fi
+        fi
+
+        rmdir "$_lock" 2>/dev/null
+    fi
+fi
+
+# Re-read the clock — a fetch above may have just refreshed the cache
+jq -c --argjson now "$(date +%s)" --argjson max_age "$USAGE_MAX_AGE" \
+    'select(($now - (.fetched_at // 0)) <= $max_age)' "$USAGE_FILE" 2>/dev/null